@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-import random
+import numpy as np
 from faker import Faker
+import uuid
 from datetime import datetime
 
 # ------------------------------
@@ -16,38 +17,38 @@ All data is fake and safe for educational purposes.
 """)
 
 # ------------------------------
-# Initialize Faker
+# Random Seed
 # ------------------------------
-fake = Faker()
-Faker.seed(123)
-random.seed(123)
+SEED = 123
 
 # ------------------------------
 # Generate Fake Patients
 # ------------------------------
-def generate_fake_patients(n=10):
+@st.cache_data(show_spinner=False)
+def generate_fake_patients(n=10, seed=SEED):
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = np.random.default_rng(seed)
     races = ['White', 'Black', 'Asian', 'Other']
     ethnicities = ['Not Hispanic or Latino', 'Hispanic or Latino']
-    data = []
-    for i in range(n):
-        gender = random.choice(['Male', 'Female'])
-        race = random.choice(races)
-        ethnicity = random.choice(ethnicities)
-        birthdate = fake.date_of_birth(minimum_age=18, maximum_age=90)
-        data.append({
-            "person_source_value": fake.unique.uuid4(),
-            "full_name": fake.name_male() if gender == 'Male' else fake.name_female(),
-            "gender": gender,
-            "birthdate": birthdate,
-            "address": fake.address(),
-            "phone": fake.phone_number(),
-            "email": fake.email(),
-            "race": race,
-            "ethnicity": ethnicity
-        })
-    df = pd.DataFrame(data)
-    df["birthdate"] = pd.to_datetime(df["birthdate"])
-    return df
+    genders = rng.choice(['Male', 'Female'], n)
+    # Birthdates for ages 18 through 90 inclusive, as fake.date_of_birth does
+    today = pd.Timestamp.today().normalize()
+    latest = today - pd.DateOffset(years=18)
+    earliest = today - pd.DateOffset(years=91) + pd.Timedelta(days=1)
+    offsets = rng.integers(0, (latest - earliest).days + 1, n)
+    birthdates = earliest + pd.to_timedelta(offsets, unit="D")
+    return pd.DataFrame({
+        "person_source_value": [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(n)],
+        "full_name": [fake.name_male() if g == 'Male' else fake.name_female() for g in genders],
+        "gender": genders,
+        "birthdate": birthdates,
+        "address": [fake.address() for _ in range(n)],
+        "phone": [fake.phone_number() for _ in range(n)],
+        "email": [fake.email() for _ in range(n)],
+        "race": rng.choice(races, n),
+        "ethnicity": rng.choice(ethnicities, n)
+    })
 
 num_patients = st.slider("Number of patients to generate", 5, 50, 10)
 original_data = generate_fake_patients(num_patients)
@@ -56,30 +57,29 @@ st.write("### Sample Fake Patients Data")
 st.dataframe(original_data.head())
 
 # ------------------------------
-# Mapping Functions for OMOP
+# Concept Mappings for OMOP
 # ------------------------------
-def map_gender(gender):
-    return {'Male': 8507, 'Female': 8532}.get(gender, 0)
-
-def map_race(race):
-    return {'White': 8527, 'Black': 8516, 'Asian': 8515, 'Other': 8529}.get(race, 0)
+GENDER_MAP = {'Male': 8507, 'Female': 8532}
+RACE_MAP = {'White': 8527, 'Black': 8516, 'Asian': 8515, 'Other': 8529}
+ETHNICITY_MAP = {'Not Hispanic or Latino': 38070399, 'Hispanic or Latino': 38003563}
 
-def map_ethnicity(ethnicity):
-    return {'Not Hispanic or Latino': 38070399, 'Hispanic or Latino': 38003563}.get(ethnicity, 0)
+def map_concept(series, mapping):
+    return series.map(mapping).fillna(0).astype('int64')
 
 # ------------------------------
 # Convert to OMOP Person Table
 # ------------------------------
 def convert_to_omop_person(df):
+    birthdate = df["birthdate"].dt
     return pd.DataFrame({
         "person_id": range(1, len(df) + 1),
-        "gender_concept_id": df["gender"].map(map_gender),
-        "year_of_birth": df["birthdate"].dt.year,
-        "month_of_birth": df["birthdate"].dt.month,
-        "day_of_birth": df["birthdate"].dt.day,
+        "gender_concept_id": map_concept(df["gender"], GENDER_MAP),
+        "year_of_birth": birthdate.year,
+        "month_of_birth": birthdate.month,
+        "day_of_birth": birthdate.day,
         "birth_datetime": df["birthdate"],
-        "race_concept_id": df["race"].map(map_race),
-        "ethnicity_concept_id": df["ethnicity"].map(map_ethnicity),
+        "race_concept_id": map_concept(df["race"], RACE_MAP),
+        "ethnicity_concept_id": map_concept(df["ethnicity"], ETHNICITY_MAP),
         "location_id": None,
         "provider_id": None,
         "care_site_id": None,
@@ -101,33 +101,38 @@ st.dataframe(omop_person.head())
 # ------------------------------
 icd_to_omop = {"E11.9": 201826, "I10": 320128, "J45.909": 317009, "F32.9": 440383}
 icd_codes = list(icd_to_omop.keys())
+ICD_ARR = np.array(icd_codes)
+CONCEPT_ARR = np.array(list(icd_to_omop.values()), dtype=np.int64)
 
-def generate_full_condition_occurrence(person_df):
-    conditions = []
-    for i, person in person_df.iterrows():
-        num_conditions = random.randint(1, 3)
-        for _ in range(num_conditions):
-            icd = random.choice(icd_codes)
-            start_date = fake.date_between(start_date='-5y', end_date='-6m')
-            end_date = fake.date_between(start_date=start_date, end_date='today')
-            conditions.append({
-                "condition_occurrence_id": len(conditions) + 1,
-                "person_id": person['person_id'],
-                "condition_concept_id": icd_to_omop[icd],
-                "condition_start_date": start_date,
-                "condition_start_datetime": pd.to_datetime(start_date),
-                "condition_end_date": end_date,
-                "condition_end_datetime": pd.to_datetime(end_date),
-                "condition_type_concept_id": 32020,
-                "stop_reason": None,
-                "provider_id": None,
-                "visit_occurrence_id": None,
-                "visit_detail_id": None,
-                "condition_source_value": icd,
-                "condition_source_concept_id": 0,
-                "condition_status_concept_id": 0
-            })
-    return pd.DataFrame(conditions)
+def generate_full_condition_occurrence(person_df, seed=SEED):
+    rng = np.random.default_rng(seed)
+    num_conditions = rng.integers(1, 4, len(person_df))
+    person_ids = np.repeat(person_df["person_id"].to_numpy(), num_conditions)
+    total = person_ids.size
+    icd_idx = rng.integers(0, ICD_ARR.size, total)
+    # Start between 5 years and 6 months ago, end between start and today
+    start_offset = rng.integers(182, 5 * 365 + 1, total)
+    end_offset = rng.integers(0, start_offset + 1)
+    today = pd.Timestamp.today().normalize()
+    start_dates = today - pd.to_timedelta(start_offset, unit="D")
+    end_dates = today - pd.to_timedelta(end_offset, unit="D")
+    return pd.DataFrame({
+        "condition_occurrence_id": np.arange(1, total + 1),
+        "person_id": person_ids,
+        "condition_concept_id": CONCEPT_ARR[icd_idx],
+        "condition_start_date": start_dates.date,
+        "condition_start_datetime": start_dates,
+        "condition_end_date": end_dates.date,
+        "condition_end_datetime": end_dates,
+        "condition_type_concept_id": 32020,
+        "stop_reason": None,
+        "provider_id": None,
+        "visit_occurrence_id": None,
+        "visit_detail_id": None,
+        "condition_source_value": ICD_ARR[icd_idx],
+        "condition_source_concept_id": 0,
+        "condition_status_concept_id": 0
+    })
 
 condition_occurrence = generate_full_condition_occurrence(omop_person)
 st.write("### Simulated Condition Occurrence Table")